@@ -2,16 +2,18 @@ import os
 import subprocess
 import zipfile
 import argparse
+import bisect
 import math
+import io
 import wave
 import shutil
 import sys
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from xml.sax.saxutils import escape
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import os.path as osp
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.cluster import DBSCAN
 
 # --- CONFIGURATION CONSTANTS ---
 DEFAULT_BPM = 100.0
@@ -22,6 +24,12 @@ KERNEL_SIGMA = 0.02         # Gaussian variance for BPM alignment
 BPM_PERCENTILE = 98.0       # Threshold percentile for correlation filtering
 CLUSTER_EPS = 4.0           # Max distance between BPM points in the same cluster
 
+# Candidate BPMs, their 1/16th note durations and the Gaussian kernel factor
+_BPM_RANGE = np.arange(MIN_BPM, MAX_BPM + BPM_STEP, BPM_STEP, dtype=np.float64)
+_D_RANGE = 15.0 / _BPM_RANGE
+_INV_TWO_SIGMA2 = 1.0 / (2.0 * KERNEL_SIGMA**2)
+_CORR_BLOCK = 1 << 18       # Elements per block of the NumPy correlation sweep
+
 def find_rx2slices():
     executable = "rx2slices"
     if sys.platform == "win32":
@@ -37,49 +45,101 @@ def find_rx2slices():
         return path_executable
     return None
 
-def estimate_bpm(slice_starts, suggestion=None, debug=False):
+def _bpm_correlations_numpy(slices, d_range, inv_two_sigma2):
+    # Offsets of every slice from the 1/16th grid of every candidate BPM,
+    # computed in (rows, N) blocks sized to stay in cache for long loops.
+    # float64 throughout: float32 rounding flips near-ties between a BPM and
+    # its double, and the result would differ from the numba kernel
+    correlations = np.empty(d_range.size)
+    rows = max(1, _CORR_BLOCK // slices.size)
+    buf = np.empty((min(rows, d_range.size), slices.size), dtype=np.float64)
+    for lo in range(0, d_range.size, rows):
+        d = d_range[lo:lo + rows, None]
+        offsets = buf[:d.shape[0]]
+        np.mod(slices[None, :], d, out=offsets)
+        np.subtract(offsets, d, out=offsets, where=offsets > d / 2)
+        offsets *= offsets
+        offsets *= -inv_two_sigma2
+        np.exp(offsets, out=offsets)
+        offsets.mean(axis=1, out=correlations[lo:lo + rows])
+    return correlations
+
+def _bpm_correlations_loop(slices, d_range, inv_two_sigma2):
+    # Same as the NumPy version, fused into one pass without temporaries;
+    # only ever called once compiled by get_bpm_correlations
+    out = np.empty(d_range.size)
+    for b in numba.prange(d_range.size):
+        d = d_range[b]
+        acc = 0.0
+        for s in slices:
+            o = s - d * math.floor(s / d)
+            if o > d * 0.5:
+                o -= d
+            acc += math.exp(-o * o * inv_two_sigma2)
+        out[b] = acc / slices.size
+    return out
+
+_bpm_correlations = None
+
+def get_bpm_correlations():
+    """
+    Returns the BPM correlation kernel, compiling it with numba on first use.
+    numba is imported lazily so that it does not slow down startup (e.g. in
+    --ms mode); without numba the NumPy version is used.
+    """
+    global _bpm_correlations, numba
+    if _bpm_correlations is None:
+        try:
+            import numba
+            _bpm_correlations = numba.njit(parallel=True, fastmath=True, cache=True)(_bpm_correlations_loop)
+        except ImportError:
+            _bpm_correlations = _bpm_correlations_numpy
+    return _bpm_correlations
+
+def estimate_bpm(slice_starts, suggestion=None, debug=False, log=print):
     """
     Finds optimal BPM by clustering high-correlation bpms.
     If a suggestion is provided, picks the cluster closest to it.
+    Debug lines are passed to log.
     """
     if not slice_starts:
         return suggestion if suggestion else DEFAULT_BPM
 
-    slices = np.array(slice_starts)
-    bpm_range = np.arange(MIN_BPM, MAX_BPM + BPM_STEP, BPM_STEP)
-    correlations = []
+    # Everything stays float64, in both the NumPy and numba kernels: float32
+    # rounding flips near-ties between a BPM and its double
+    slices = np.asarray(slice_starts, dtype=np.float64)
+    bpm_range = _BPM_RANGE
+    correlations = get_bpm_correlations()(slices, _D_RANGE, _INV_TWO_SIGMA2)
 
-    for bpm in bpm_range:
-        d = 15.0 / bpm
-        offsets = (slices % d)
-        offsets = np.where(offsets > d/2, offsets - d, offsets)
-        corr = np.mean(np.exp(-(offsets**2) / (2 * KERNEL_SIGMA**2)))
-        correlations.append(corr)
-
-    correlations = np.array(correlations)
     threshold = np.percentile(correlations, BPM_PERCENTILE)
     mask = correlations >= threshold
-    high_corr_bpms = bpm_range[mask].reshape(-1, 1)
+    high_corr_bpms = bpm_range[mask]
     high_corr_vals = correlations[mask]
     
     if len(high_corr_bpms) == 0:
         return suggestion if suggestion else bpm_range[np.argmax(correlations)]
 
-    clustering = DBSCAN(eps=CLUSTER_EPS, min_samples=1).fit(high_corr_bpms)
-    labels = clustering.labels_
-    n_clusters = len(set(labels))
+    # A single cluster (the usual case for clean loops) is its own answer,
+    # whatever the suggestion
+    if np.ptp(high_corr_bpms) <= CLUSTER_EPS:
+        idx = np.argmax(high_corr_vals)
+        if debug:
+            log(f"  [BPM Debug] Clusters found: ['{round(high_corr_bpms[idx],2)} (corr: {round(high_corr_vals[idx],4)})']")
+        return round(float(high_corr_bpms[idx]), 2)
+
+    # The candidates are sorted on a uniform grid, so clusters are just
+    # runs of consecutive BPMs with gaps of at most CLUSTER_EPS
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(high_corr_bpms) > CLUSTER_EPS) + 1))
+    ends = np.append(starts[1:], len(high_corr_bpms))
 
     cluster_peaks = []
-    for i in range(n_clusters):
-        m = (labels == i)
-        idx_in_cluster = np.argmax(high_corr_vals[m])
-        peak_bpm = high_corr_bpms[m][idx_in_cluster][0]
-        peak_corr = high_corr_vals[m][idx_in_cluster]
-        cluster_peaks.append((peak_bpm, peak_corr))
+    for start, end in zip(starts, ends):
+        idx_in_cluster = start + np.argmax(high_corr_vals[start:end])
+        cluster_peaks.append((high_corr_bpms[idx_in_cluster], high_corr_vals[idx_in_cluster]))
 
     if debug:
         info = [f"{round(b,2)} (corr: {round(c,4)})" for b, c in cluster_peaks]
-        print(f"  [BPM Debug] Clusters found: {info}")
+        log(f"  [BPM Debug] Clusters found: {info}")
 
     if suggestion:
         best_bpm = min(cluster_peaks, key=lambda x: abs(x[0] - suggestion))[0]
@@ -106,12 +166,66 @@ def estimate_swing(slice_starts, bpm):
     
     # Residual error relative to straight grid
     Y = slices - (anchor + n_indices * d)
-    X = (is_odd * (d / 2.0)).reshape(-1, 1)
+    X = is_odd * (d / 2.0)
     
-    model = LinearRegression(fit_intercept=False).fit(X, Y)
-    swing = model.coef_[0]
+    # Least squares fit of Y = swing * X without intercept
+    denom = float(np.dot(X, X))
+    swing = 0.0 if denom == 0.0 else float(np.dot(X, Y) / denom)
     
-    return np.clip(swing, 0.0, 1.0)
+    return float(np.clip(swing, 0.0, 1.0))
+
+def analyze_track(wav_path, slice_starts, info, suggestion=None, include_16ths=False, snap_threshold=0.05, debug=False):
+    """
+    Estimates BPM, swing and warp markers of a file. Returns the track dict
+    for DAWProjectGenerator.append_track; runs in a worker process, so the
+    console report is returned with it instead of being printed.
+    """
+    base = osp.basename(wav_path)
+    report = []
+    if debug: report.append(f"--- Analyzing {base} ---")
+
+    bpm = estimate_bpm(slice_starts, suggestion, debug, report.append)
+    swing = estimate_swing(slice_starts, bpm)
+
+    d = 15.0 / bpm
+    first_slice_offset = slice_starts[0] if slice_starts else 0.0
+
+    # Grid is now anchored to the first slice start
+    end_raw_index = round((info['dur'] - first_slice_offset) / d)
+
+    s_arr = np.asarray(slice_starts, dtype=float)
+    raw_index = np.rint((s_arr - first_slice_offset) / d).astype(np.int64)
+    swing_index_offset = (raw_index & 1) * (swing * 0.5)
+
+    # Theoretical time including swing relative to anchor
+    theoretical_time = first_slice_offset + (raw_index + swing_index_offset) * d
+
+    time_error = np.abs(s_arr - theoretical_time)
+    total_grid_error = float((time_error / d).sum())
+
+    keep = time_error <= snap_threshold
+    if not include_16ths:
+        keep &= (raw_index & 1) == 0
+    idxs = np.flatnonzero(keep)
+
+    # beat_pos is shifted by swing relative to the first slice (beat 0)
+    beat_pos = (raw_index[idxs] + swing_index_offset[idxs]) / 4.0
+    warp_markers = [{"beat": b, "seconds": sec} for b, sec in zip(beat_pos.tolist(), s_arr[idxs].tolist())]
+
+    final_clip_beats = math.ceil(end_raw_index) / 4.0
+
+    report.append(f"File: {base}")
+    report.append(f"  > Selected BPM:   {bpm:.2f} (Total Error: {total_grid_error:.4f} 1/16ths)")
+    report.append(f"  > Swing: {swing:.2f}")
+
+    return {
+        "name": base, "basename": base, "wav_path": wav_path,
+        "bpm": bpm, "swing": swing,
+        "warp_markers": warp_markers, "first_slice_offset": first_slice_offset,
+        "clip_duration_beats": float(max(1.0, final_clip_beats)),
+        "file_duration": info['dur'], "sample_rate": info['sr'],
+        "channels": info['chans'], "report": report
+    }
 
 class DAWProjectGenerator:
     def __init__(self, include_16ths=False, snap_threshold=0.05, debug=False):
@@ -126,56 +240,20 @@ class DAWProjectGenerator:
         return f"id{self.id_counter}"
 
     def add_track(self, wav_path, slice_starts, info, suggestion=None):
-        if self.debug: print(f"--- Analyzing {osp.basename(wav_path)} ---")
-        
-        bpm = estimate_bpm(slice_starts, suggestion, self.debug)
-        swing = estimate_swing(slice_starts, bpm)
-        
-        d = 15.0 / bpm 
-        first_slice_offset = slice_starts[0] if slice_starts else 0.0
-        
-        # Grid is now anchored to the first slice start
-        end_raw_index = round((info['dur'] - first_slice_offset) / d)
-        
-        warp_markers = []
-        total_grid_error = 0.0
-
-        for i, s in enumerate(slice_starts):
-            raw_index = round((s - first_slice_offset) / d)
-            swing_index_offset = (raw_index % 2) * (swing * 0.5)
-            
-            # Theoretical time including swing relative to anchor
-            theoretical_time = first_slice_offset + (raw_index + swing_index_offset) * d
-            
-            time_error = abs(s - theoretical_time)
-            total_grid_error += (time_error / d)
-            
-            if time_error <= self.snap_threshold:
-                if (raw_index % 2 == 0) or self.include_16ths:
-                    # beat_pos is shifted by swing relative to the first slice (beat 0)
-                    beat_pos = (raw_index + swing_index_offset) / 4.0
-                    warp_markers.append({"beat": beat_pos, "seconds": s})
-
-        final_clip_beats = math.ceil(end_raw_index) / 4.0
-        
-        print(f"File: {osp.basename(wav_path)}")
-        print(f"  > Selected BPM:   {bpm:.2f} (Total Error: {total_grid_error:.4f} 1/16ths)")
-        print(f"  > Swing: {swing:.2f}")
-        
-        self.tracks.append({
-            "name": osp.basename(wav_path), "wav_path": wav_path,
-            "bpm": bpm, "swing": swing,
-            "warp_markers": warp_markers, "first_slice_offset": first_slice_offset,
-            "clip_duration_beats": float(max(1.0, final_clip_beats)),
-            "file_duration": info['dur'], "sample_rate": info['sr'],
-            "channels": info['chans'], "track_id": self.get_id(), "channel_id": self.get_id()
-        })
+        self.append_track(analyze_track(wav_path, slice_starts, info, suggestion,
+                                        self.include_16ths, self.snap_threshold, self.debug))
+
+    def append_track(self, track):
+        print("\n".join(track.pop("report")))
+        track["track_id"] = self.get_id()
+        track["channel_id"] = self.get_id()
+        self.tracks.append(track)
 
     def build_project_xml(self, global_bpm):
         root = ET.Element("Project", version="1.0")
         ET.SubElement(root, "Application", name="rx2bitwig", version="1.0")
         transport = ET.SubElement(root, "Transport")
-        ET.SubElement(transport, "Tempo", value=str(global_bpm), id="id0", name="Tempo")
+        ET.SubElement(transport, "Tempo", value=fmt(global_bpm), id="id0", name="Tempo")
         ET.SubElement(transport, "TimeSignature", denominator="4", numerator="4", id="id1")
 
         struct = ET.SubElement(root, "Structure")
@@ -187,40 +265,49 @@ class DAWProjectGenerator:
         master = ET.SubElement(struct, "Track", contentType="audio notes", loaded="true", id="master_track", name="Master")
         ET.SubElement(master, "Channel", audioChannels="2", role="master", id="master_chan")
 
-        arr = ET.SubElement(root, "Arrangement", id="arr_id")
-        arr_lanes = ET.SubElement(arr, "Lanes", timeUnit="beats")
+        # Only the small skeleton goes through ElementTree; the Arrangement and
+        # Scenes sections, which grow with tracks and warp markers, are written
+        # straight to the buffer in the same indented layout
+        ET.indent(root, space="  ")
+        buf = io.BytesIO()
+        buf.write(ET.tostring(root, encoding="utf-8", xml_declaration=True).removesuffix(b"</Project>"))
+
+        buf.write(b'  <Arrangement id="arr_id">\n    <Lanes timeUnit="beats">\n')
         for t in self.tracks:
-            ET.SubElement(arr_lanes, "Lanes", track=t["track_id"], id=self.get_id())
+            buf.write(f'      <Lanes track="{t["track_id"]}" id="{self.get_id()}" />\n'.encode())
+        buf.write(b'    </Lanes>\n  </Arrangement>\n')
 
-        scenes = ET.SubElement(root, "Scenes")
-        scene = ET.SubElement(scenes, "Scene", id="scene0", name="Scene 1")
-        scene_lanes = ET.SubElement(scene, "Lanes", id="lanes_id")
-        
+        buf.write(b'  <Scenes>\n    <Scene id="scene0" name="Scene 1">\n      <Lanes id="lanes_id">\n')
         for t in self.tracks:
-            slot = ET.SubElement(scene_lanes, "ClipSlot", hasStop="true", track=t["track_id"], id=self.get_id())
-            duration_str = str(t["clip_duration_beats"])
-            clip = ET.SubElement(slot, "Clip", time="0.0", duration=duration_str, name=t["name"])
-            clips_inner = ET.SubElement(clip, "Clips")
-            clip_event = ET.SubElement(clips_inner, "Clip", time=str(-t["first_slice_offset"]), duration=duration_str, contentTimeUnit="beats")
-            warps = ET.SubElement(clip_event, "Warps", contentTimeUnit="seconds", timeUnit="beats")
-            audio_tag = ET.SubElement(warps, "Audio", channels=str(t["channels"]), sampleRate=str(t["sample_rate"]), duration=str(t["file_duration"]), id=self.get_id())
-            ET.SubElement(audio_tag, "File", path=f"audio/{osp.basename(t['wav_path'])}")
-
-            for m in t["warp_markers"]:
-                ET.SubElement(warps, "Warp", time=str(m["beat"]), contentTime=str(m["seconds"]))
-            ET.SubElement(warps, "Warp", time=duration_str, contentTime=str(t["file_duration"]))
-
-        raw_xml = ET.tostring(root, encoding="utf-8")
-        return minidom.parseString(raw_xml).toprettyxml(indent="  ")
+            name = xml_attr(t["name"])
+            duration_str = fmt(t["clip_duration_beats"])
+            buf.write(f'        <ClipSlot hasStop="true" track="{t["track_id"]}" id="{self.get_id()}">\n'
+                      f'          <Clip time="0.0" duration="{duration_str}" name="{name}">\n'
+                      f'            <Clips>\n'
+                      f'              <Clip time="{fmt(-t["first_slice_offset"])}" duration="{duration_str}" contentTimeUnit="beats">\n'
+                      f'                <Warps contentTimeUnit="seconds" timeUnit="beats">\n'
+                      f'                  <Audio channels="{t["channels"]}" sampleRate="{t["sample_rate"]}" duration="{fmt(t["file_duration"])}" id="{self.get_id()}">\n'
+                      f'                    <File path="audio/{xml_attr(t["basename"])}" />\n'
+                      f'                  </Audio>\n'.encode())
+            buf.writelines(f'                  <Warp time="{fmt(m["beat"])}" contentTime="{fmt(m["seconds"])}" />\n'.encode()
+                           for m in t["warp_markers"])
+            buf.write(f'                  <Warp time="{duration_str}" contentTime="{fmt(t["file_duration"])}" />\n'
+                      f'                </Warps>\n'
+                      f'              </Clip>\n'
+                      f'            </Clips>\n'
+                      f'          </Clip>\n'
+                      f'        </ClipSlot>\n'.encode())
+        buf.write(b'      </Lanes>\n    </Scene>\n  </Scenes>\n</Project>')
+        return buf.getvalue()
 
     def save(self, output_path, bpm_override=None):
         if not self.tracks: return
         global_bpm = bpm_override if bpm_override else max(t["bpm"] for t in self.tracks)
-        with zipfile.ZipFile(output_path, 'w') as zipf:
+        with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zipf:
             zipf.writestr("metadata.xml", '<?xml version="1.0" encoding="UTF-8" standalone="yes"?><MetaData/>')
             zipf.writestr("project.xml", self.build_project_xml(global_bpm))
             for t in self.tracks:
-                zipf.write(t["wav_path"], f"audio/{osp.basename(t['wav_path'])}")
+                write_stored(zipf, t["wav_path"], f"audio/{t['basename']}")
         print(f"Created DAWProject: {output_path} at {global_bpm} BPM")
 
 class MultisampleGenerator:
@@ -231,33 +318,63 @@ class MultisampleGenerator:
         self.slices = []
 
     def add_slice(self, start_sec):
-        self.slices.append(start_sec)
+        bisect.insort(self.slices, start_sec)
 
     def _generate_xml(self):
-        name = osp.splitext(osp.basename(self.wav_path))[0]
+        base = osp.basename(self.wav_path)
+        name = osp.splitext(base)[0]
         root = ET.Element("multisample", name=name)
         midi_note = 36
-        for start_sec in sorted(self.slices):
-            start_frame = start_sec * self.sample_rate
+        frames = np.asarray(self.slices, dtype=float) * self.sample_rate
+        stop = f"{self.total_frames:.3f}"
+        for start_frame in frames.tolist():
+            start = f"{start_frame:.3f}"
             sample_node = ET.SubElement(root, "sample", {
-                "file": osp.basename(self.wav_path),
-                "sample-start": f"{start_frame:.3f}",
-                "sample-stop": f"{self.total_frames:.3f}",
+                "file": base,
+                "sample-start": start,
+                "sample-stop": stop,
                 "zone-logic": "always-play"
             })
             ET.SubElement(sample_node, "key", {"high": str(midi_note), "low": str(midi_note), "root": "60", "track": "0.0000"})
-            ET.SubElement(sample_node, "loop", {"mode": "off", "start": f"{start_frame:.3f}", "stop": f"{self.total_frames:.3f}"})
+            ET.SubElement(sample_node, "loop", {"mode": "off", "start": start, "stop": stop})
             midi_note = min(midi_note + 1, 127)
-        raw_str = ET.tostring(root, encoding="utf-8")
-        return minidom.parseString(raw_str).toprettyxml(indent="   ")
+        ET.indent(root, space="   ")
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)
 
     def save(self):
         output_path = osp.splitext(self.wav_path)[0] + ".multisample"
-        with zipfile.ZipFile(output_path, 'w') as zipf:
+        with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zipf:
             zipf.writestr("multisample.xml", self._generate_xml())
-            zipf.write(self.wav_path, osp.basename(self.wav_path))
+            write_stored(zipf, self.wav_path, osp.basename(self.wav_path))
         print(f"Created Multisample: {output_path}")
 
+def xml_attr(value):
+    """
+    Escapes a string for use inside a double-quoted XML attribute.
+    """
+    return escape(value, {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"})
+
+def fmt(x):
+    """
+    Formats a float XML attribute with microsecond/micro-beat precision.
+    """
+    return f"{x:.6f}"
+
+def write_stored(zipf, path, arcname):
+    """
+    Copies a file uncompressed into an open zip archive through a single
+    reused 1 MiB buffer.
+    """
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    zinfo.compress_type = zipfile.ZIP_STORED
+    buf = bytearray(1 << 20)
+    view = memoryview(buf)
+    with open(path, 'rb', buffering=0) as src, zipf.open(zinfo, 'w', force_zip64=True) as dst:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(src.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while n := src.readinto(buf):
+            dst.write(view[:n])
+
 def get_wav_info(wav_path):
     with wave.open(wav_path, 'rb') as w:
         frames, rate = w.getnframes(), w.getframerate()
@@ -273,6 +390,43 @@ def parse_file_arg(arg):
             return arg, None
     return arg, None
 
+def limit_numba_threads():
+    """
+    Pool initializer: makes numba, which is imported lazily, start one thread.
+    """
+    os.environ["NUMBA_NUM_THREADS"] = "1"
+
+def process_file(f_path, suggestion, rx2bin=None, include_16ths=False, snap_threshold=0.05, debug=False, ms=False):
+    """
+    Converts a single input file. Writes a .multisample in ms mode, otherwise
+    returns the analyzed track for a DAWProject (None if the file is skipped).
+    """
+    if f_path.lower().endswith(".rx2"):
+        if not rx2bin: return None
+        subprocess.run([rx2bin, f_path], check=True)
+        wav = osp.splitext(f_path)[0] + ".wav"
+    else:
+        wav = f_path
+
+    slices_path = osp.join(osp.dirname(wav), ".slices", osp.splitext(osp.basename(wav))[0] + ".slices")
+
+    if not (osp.exists(wav) and osp.exists(slices_path)):
+        return None
+
+    starts = []
+    for _, elem in ET.iterparse(slices_path, events=("end",)):
+        if elem.tag == "slice":
+            starts.append(float(elem.get("start")))
+            elem.clear()
+    slice_starts = sorted(starts)
+    info = get_wav_info(wav)
+    if ms:
+        ms_gen = MultisampleGenerator(wav, info['sr'], info['frames'])
+        for start in slice_starts: ms_gen.add_slice(start)
+        ms_gen.save()
+        return None
+    return analyze_track(wav, slice_starts, info, suggestion, include_16ths, snap_threshold, debug)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process WAV/RX2 to DAWProject or Multisample")
     parser.add_argument("files", nargs="*", help="Files (optionally filename:bpm)")
@@ -293,25 +447,15 @@ if __name__ == "__main__":
             for line in f:
                 if line.strip(): input_data.append(parse_file_arg(line.strip()))
     
-    for f_path, suggestion in input_data:
-        if f_path.lower().endswith(".rx2"):
-            if not rx2bin: continue
-            subprocess.run([rx2bin, f_path], check=True)
-            wav = osp.splitext(f_path)[0] + ".wav"
-        else:
-            wav = f_path
-            
-        slices_path = osp.join(osp.dirname(wav), ".slices", osp.splitext(osp.basename(wav))[0] + ".slices")
-
-        if osp.exists(wav) and osp.exists(slices_path):
-            tree = ET.parse(slices_path)
-            slice_starts = sorted([float(s.get("start")) for s in tree.findall("slice")])
-            info = get_wav_info(wav)
-            if args.ms:
-                ms_gen = MultisampleGenerator(wav, info['sr'], info['frames'])
-                for start in slice_starts: ms_gen.add_slice(start)
-                ms_gen.save()
-            else:
-                daw_gen.add_track(wav, slice_starts, info, suggestion)
+    worker = partial(process_file, rx2bin=rx2bin, include_16ths=daw_gen.include_16ths,
+                     snap_threshold=daw_gen.snap_threshold, debug=daw_gen.debug, ms=args.ms)
+    # With several files the pool already uses every core, so each worker's
+    # numba kernel runs single-threaded; a single file keeps all numba threads
+    initializer = limit_numba_threads if len(input_data) > 1 else None
+    with ProcessPoolExecutor(initializer=initializer) as ex:
+        results = list(ex.map(worker, [f for f, _ in input_data], [b for _, b in input_data]))
+
+    for track in results:
+        if track is not None: daw_gen.append_track(track)
 
     if not args.ms: daw_gen.save(args.output, args.bpm)